@@ -1,15 +1,32 @@
 """Provide helper methods for imposing structure onto raw data fetched from external APIs."""
 
 from enum import Enum
+from functools import lru_cache
+from typing import TypeVar
 
+_EnumType = TypeVar("_EnumType", bound=Enum)
 
-def map_to_enum(cls: type[Enum], value: str, mapping: dict) -> Enum:
-    """Use in enum _missing_ methods to map alternate constructions to python-legal values."""
-    try:
-        if value in mapping:
-            return mapping[value]
-        msg = f"'{value}' is not a valid {cls.__name__}"
-        raise ValueError(msg)
-    except AttributeError as _:
-        msg = f"'{value}' is not a valid {cls.__name__}"
-        raise ValueError(msg) from None
+
+@lru_cache(maxsize=1024)
+def get_enum(raw_value: str, candidate_enum: type[_EnumType]) -> _EnumType:
+    """Convert a raw API value, e.g. ``"ACTIVE_NOT_RECRUITING"``, into an enum member
+
+    :param raw_value: raw string from JSON response
+    :param candidate_enum: enum to convert value into
+    :return: matching enum member
+    :raise ValueError: if no member matches the value
+    """
+    return candidate_enum(raw_value.lower())
+
+
+def add_enum_aliases(cls: type[Enum], aliases: dict[str, Enum]) -> None:
+    """Register alternate constructions of enum values as direct lookups.
+
+    Aliases added this way resolve in the enum's value map, so construction doesn't
+    have to fall through to ``_missing_``.
+
+    :param cls: enum class to extend
+    :param aliases: mapping from alternate value to existing member
+    """
+    for alias, member in aliases.items():
+        cls._value2member_map_[alias] = member
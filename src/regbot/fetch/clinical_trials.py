@@ -41,41 +41,42 @@ Get all serious adverse events:
 
 import datetime
 import logging
+import re
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
 from enum import StrEnum
+from functools import lru_cache
 from typing import NamedTuple
 
-import requests
-from requests.exceptions import RequestException
-
-from .class_utils import map_to_enum
+from .class_utils import add_enum_aliases, get_enum
+from .http_utils import get_json
 
 _logger = logging.getLogger(__name__)
 
 
+_DATE_PATTERN = re.compile(r"(\d{4})(?:-(\d{2})(?:-(\d{2}))?)?", re.ASCII)
+
+
+@lru_cache(maxsize=4096)
 def _get_dt_object(raw_date: str) -> datetime.datetime:
     """Extract datetime object from raw date.
 
     :param raw_date: raw string from JSON response
     :return: structured datetime instance depending on available data
     """
+    msg = f"Unable to format {raw_date} as YYYY-MM-DD, YYYY-MM, or YYYY"
+    match = _DATE_PATTERN.fullmatch(raw_date)
+    if not match:
+        _logger.error(msg)
+        raise ValueError(msg)
+    year, month, day = match.groups()
     try:
-        return datetime.datetime.strptime(raw_date, "%Y-%m-%d").replace(
-            tzinfo=datetime.UTC
+        return datetime.datetime(
+            int(year), int(month or 1), int(day or 1), tzinfo=datetime.UTC
         )
-    except ValueError:
-        try:
-            return datetime.datetime.strptime(raw_date, "%Y-%m").replace(
-                tzinfo=datetime.UTC
-            )
-        except ValueError:
-            try:
-                return datetime.datetime.strptime(raw_date, "%Y").replace(
-                    tzinfo=datetime.UTC
-                )
-            except ValueError as e:
-                msg = f"Unable to format {raw_date} as YYYY-MM-DD, YYYY-MM, or YYYY"
-                _logger.error(msg)
-                raise ValueError(msg) from e
+    except ValueError as e:
+        _logger.error(msg)
+        raise ValueError(msg) from e
 
 
 class AgencyClass(StrEnum):
@@ -152,6 +153,16 @@ def _format_protocol_id(id_input: dict) -> ProtocolIdentification:
         ]
     else:
         org_study_id, secondary_ids = None, None
+    organization_input = id_input.get("organization")
+    if organization_input:
+        organization = Organization(
+            full_name=organization_input.get("fullName"),
+            org_class=get_enum(organization_input["class"], AgencyClass)
+            if organization_input.get("class")
+            else None,
+        )
+    else:
+        organization = None
     return ProtocolIdentification(
         nct_id=f"clinicaltrials:{id_input['nctId']}",
         nct_id_aliases=id_input.get("nctIdAlias"),
@@ -159,12 +170,7 @@ def _format_protocol_id(id_input: dict) -> ProtocolIdentification:
         secondary_org_ids=secondary_ids,
         brief_title=id_input["briefTitle"],
         official_title=id_input.get("officialTitle"),
-        organization=Organization(
-            full_name=id_input["organization"]["fullName"],
-            org_class=AgencyClass(id_input["organization"]["class"].lower())
-            if id_input.get("organization", {}).get("class")
-            else None,
-        ),
+        organization=organization,
     )
 
 
@@ -234,60 +240,44 @@ class ProtocolStatus(NamedTuple):
     results_waived: bool | None
 
 
+# (ProtocolStatusDates date field, type field, raw date struct key)
+_STATUS_DATE_STRUCTS = (
+    ("start_date", "start_date_type", "startDateStruct"),
+    (
+        "primary_completion_date",
+        "primary_completion_date_type",
+        "primaryCompletionDateStruct",
+    ),
+    ("completion_date", "completion_date_type", "completionDateStruct"),
+)
+
+# (ProtocolStatusDates field, raw date key)
+_STATUS_DATES = (
+    ("study_first_submit_date", "studyFirstSubmitDate"),
+    ("results_first_submit_date", "resultsFirstSubmitDate"),
+    ("last_update_submit_date", "lastUpdateSubmitDate"),
+)
+
+
 def _format_protocol_status_dates(status_input: dict) -> ProtocolStatusDates:
     """Structure dates from ProtocolSection.StatusModule
 
     :param status_input: StatusModule JSON
     :return: structured dates data
     """
-    if "primaryCompletionDateStruct" in status_input:
-        primary_completion_date = _get_dt_object(
-            status_input["primaryCompletionDateStruct"]["date"]
-        )
-        primary_completion_date_type = (
-            DateType(status_input["primaryCompletionDateStruct"]["type"].lower())
-            if "type" in status_input["primaryCompletionDateStruct"]
-            else None
-        )
-    else:
-        primary_completion_date, primary_completion_date_type = None, None
-
-    if "completionDateStruct" in status_input:
-        completion_date = _get_dt_object(status_input["completionDateStruct"]["date"])
-        completion_date_type = (
-            DateType(status_input["completionDateStruct"]["type"].lower())
-            if "type" in status_input["completionDateStruct"]
-            else None
-        )
-    else:
-        completion_date, completion_date_type = None, None
-
-    if "startDateStruct" in status_input:
-        start_date = _get_dt_object(status_input["startDateStruct"]["date"])
-        start_date_type = (
-            DateType(status_input["startDateStruct"]["type"].lower())
-            if "type" in status_input["startDateStruct"]
-            else None
-        )
-    else:
-        start_date, start_date_type = None, None
-    return ProtocolStatusDates(
-        start_date=start_date,
-        start_date_type=start_date_type,
-        primary_completion_date=primary_completion_date,
-        primary_completion_date_type=primary_completion_date_type,
-        completion_date=completion_date,
-        completion_date_type=completion_date_type,
-        study_first_submit_date=_get_dt_object(status_input["studyFirstSubmitDate"])
-        if "studyFirstSubmitDate" in status_input
-        else None,
-        results_first_submit_date=_get_dt_object(status_input["resultsFirstSubmitDate"])
-        if "resultsFirstSubmitDate" in status_input
-        else None,
-        last_update_submit_date=_get_dt_object(status_input["lastUpdateSubmitDate"])
-        if "lastUpdateSubmitDate" in status_input
-        else None,
-    )
+    dates = {}
+    for date_field, type_field, key in _STATUS_DATE_STRUCTS:
+        date_struct = status_input.get(key)
+        if date_struct is None:
+            dates[date_field], dates[type_field] = None, None
+            continue
+        date_type = date_struct.get("type")
+        dates[date_field] = _get_dt_object(date_struct["date"])
+        dates[type_field] = get_enum(date_type, DateType) if date_type else None
+    for date_field, key in _STATUS_DATES:
+        raw_date = status_input.get(key)
+        dates[date_field] = _get_dt_object(raw_date) if raw_date is not None else None
+    return ProtocolStatusDates(**dates)
 
 
 def _format_status(status_input: dict) -> ProtocolStatus:
@@ -313,10 +303,10 @@ def _format_status(status_input: dict) -> ProtocolStatus:
         else None
     )
     return ProtocolStatus(
-        overall_status=Status(status_input["overallStatus"].lower())
+        overall_status=get_enum(status_input["overallStatus"], Status)
         if "overallStatus" in status_input
         else None,
-        last_known_status=Status(status_input["lastKnownStatus"].lower())
+        last_known_status=get_enum(status_input["lastKnownStatus"], Status)
         if "lastKnownStatus" in status_input
         else None,
         delayed_posting=status_input.get("delayedPosting"),
@@ -344,7 +334,7 @@ def _format_sponsor_collaborators(spo_collab: dict) -> SponsorCollaborators:
     """
     return SponsorCollaborators(
         lead_sponsor_name=spo_collab["leadSponsor"]["name"],
-        lead_sponsor_class=AgencyClass(spo_collab["leadSponsor"]["class"].lower())
+        lead_sponsor_class=get_enum(spo_collab["leadSponsor"]["class"], AgencyClass)
         if spo_collab.get("leadSponsor", {}).get("class")
         else None,
     )
@@ -360,6 +350,35 @@ class Oversight(NamedTuple):
     is_ppsd: bool | None
 
 
+@lru_cache(maxsize=256)
+def _make_oversight(
+    has_dmc: bool | None,
+    is_fda_regulated_drug: bool | None,
+    is_fda_regulated_device: bool | None,
+    is_unapproved_device: bool | None,
+    is_ppsd: bool | None,
+) -> Oversight:
+    """Get oversight instance for the given flags.
+
+    Every field is a nullable boolean, leaving only a few hundred possible values, so
+    one shared instance is handed out per combination rather than one per study.
+
+    :param has_dmc: whether study has a data monitoring committee
+    :param is_fda_regulated_drug: whether study tests an FDA-regulated drug
+    :param is_fda_regulated_device: whether study tests an FDA-regulated device
+    :param is_unapproved_device: whether study tests an unapproved device
+    :param is_ppsd: whether study tests a pediatric postmarket surveillance device
+    :return: shared oversight instance
+    """
+    return Oversight(
+        has_dmc=has_dmc,
+        is_fda_regulated_drug=is_fda_regulated_drug,
+        is_fda_regulated_device=is_fda_regulated_device,
+        is_unapproved_device=is_unapproved_device,
+        is_ppsd=is_ppsd,
+    )
+
+
 def _format_oversight(oversight_input: dict) -> Oversight:
     """Format ProtocolSection.OversightModule
 
@@ -368,12 +387,12 @@ def _format_oversight(oversight_input: dict) -> Oversight:
     :param oversight_input: raw JSON
     :return: structured data
     """
-    return Oversight(
-        has_dmc=oversight_input.get("oversightHasDmc"),
-        is_fda_regulated_drug=oversight_input.get("isFdaRegulatedDrug"),
-        is_fda_regulated_device=oversight_input.get("isFdaRegulatedDevice"),
-        is_unapproved_device=oversight_input.get("isUnapprovedDevice"),
-        is_ppsd=oversight_input.get("isPPSD"),
+    return _make_oversight(
+        oversight_input.get("oversightHasDmc"),
+        oversight_input.get("isFdaRegulatedDrug"),
+        oversight_input.get("isFdaRegulatedDevice"),
+        oversight_input.get("isUnapprovedDevice"),
+        oversight_input.get("isPPSD"),
     )
 
 
@@ -446,19 +465,17 @@ class StudyPhase(StrEnum):
     PHASE_3 = "phase_3"
     PHASE_4 = "phase_4"
 
-    @classmethod
-    def _missing_(cls, value):  # noqa: ANN001 ANN206
-        return map_to_enum(
-            cls,
-            value,
-            {
-                "early_phase1": cls.EARLY_PHASE_1,
-                "phase1": cls.PHASE_1,
-                "phase2": cls.PHASE_2,
-                "phase3": cls.PHASE_3,
-                "phase4": cls.PHASE_4,
-            },
-        )
+
+add_enum_aliases(
+    StudyPhase,
+    {
+        "early_phase1": StudyPhase.EARLY_PHASE_1,
+        "phase1": StudyPhase.PHASE_1,
+        "phase2": StudyPhase.PHASE_2,
+        "phase3": StudyPhase.PHASE_3,
+        "phase4": StudyPhase.PHASE_4,
+    },
+)
 
 
 class ProtocolDesign(NamedTuple):
@@ -480,7 +497,7 @@ def _format_design(design_input: dict) -> ProtocolDesign:
     enrollment = (
         Enrollment(
             enrollment_count=design_input["enrollmentInfo"].get("count"),
-            type=EnrollmentType(design_input["enrollmentInfo"]["type"].lower())
+            type=get_enum(design_input["enrollmentInfo"]["type"], EnrollmentType)
             if "type" in design_input["enrollmentInfo"]
             else None,
         )
@@ -488,8 +505,8 @@ def _format_design(design_input: dict) -> ProtocolDesign:
         else None
     )
     return ProtocolDesign(
-        study_type=StudyType(design_input["studyType"].lower()),
-        phases=[StudyPhase(p.lower()) for p in design_input["phases"]]
+        study_type=get_enum(design_input["studyType"], StudyType),
+        phases=[get_enum(p, StudyPhase) for p in design_input["phases"]]
         if "phases" in design_input
         else None,
         enrollment=enrollment,
@@ -541,7 +558,7 @@ def _format_arms_interventions(arms_ints_input: dict) -> ArmsInterventions:
     interventions = (
         [
             Intervention(
-                type=InterventionType(i["type"].lower()) if "type" in i else None,
+                type=get_enum(i["type"], InterventionType) if "type" in i else None,
                 name=i.get("name"),
                 description=i.get("description"),
                 aliases=i.get("otherNames"),
@@ -690,12 +707,14 @@ def _format_eligibility(elig_input: dict) -> Eligibility:
     return Eligibility(
         min_age=min_age,
         max_age=max_age,
-        std_age=[StandardAge(a.lower()) for a in elig_input["stdAges"]]
+        std_age=[get_enum(a, StandardAge) for a in elig_input["stdAges"]]
         if "stdAges" in elig_input
         else None,
         description=elig_input.get("eligibilityCriteria"),
         accepts_healthy=elig_input.get("healthyVolunteers"),
-        sex=CandidateSex(elig_input["sex"].lower()) if elig_input.get("sex") else None,
+        sex=get_enum(elig_input["sex"], CandidateSex)
+        if elig_input.get("sex")
+        else None,
         # distinction between gender and sex here -- these fields are for self-ID of gender
         # https://clinicaltrials.gov/policy/protocol-definitions#GenderDescription
         gender_based=elig_input.get("genderBased"),
@@ -737,7 +756,7 @@ def _format_locations(loc_input: dict) -> ContactsLocationData:
         locations.append(  # noqa: PERF401
             Location(
                 facility=i.get("facility"),
-                status=Status(i["status"].lower()) if i.get("status") else None,
+                status=get_enum(i["status"], Status) if i.get("status") else None,
                 city=i.get("city"),
                 state_province=i.get("state"),
                 postal_code=i.get("zip"),
@@ -781,17 +800,14 @@ def _format_reference(ref_input: dict) -> ProtocolReference:
     :param ref_input: raw JSON
     :return: structured data
     """
-    retraction_pmid, retraction_source = None, None
-    if "retraction" in ref_input:
-        retraction = ref_input["retraction"]
-        retraction_pmid = retraction.get("retractionPmid")
-        retraction_source = retraction.get("retractionSource")
+    retraction = ref_input.get("retraction") or {}
+    ref_type = ref_input.get("type")
     return ProtocolReference(
         pmid=ref_input.get("pmid"),
-        type=ReferenceType(ref_input["type"].lower()) if "type" in ref_input else None,
+        type=get_enum(ref_type, ReferenceType) if ref_type else None,
         citation=ref_input.get("citation"),
-        retraction_pmid=retraction_pmid,
-        retraction_source=retraction_source,
+        retraction_pmid=retraction.get("retractionPmid"),
+        retraction_source=retraction.get("retractionSource"),
     )
 
 
@@ -812,6 +828,53 @@ class Protocol(NamedTuple):
     references: list[ProtocolReference] | None
 
 
+def _format_conditions(conditions_input: dict) -> ProtocolConditions:
+    """Format ProtocolSection.ConditionsModule
+
+    See https://clinicaltrials.gov/data-api/about-api/study-data-structure#ConditionsModule
+
+    :param conditions_input: raw JSON
+    :return: structured data
+    """
+    return ProtocolConditions(
+        conditions=conditions_input.get("conditions"),
+        keywords=conditions_input.get("keywords"),
+    )
+
+
+def _format_references(references_input: dict) -> list[ProtocolReference] | None:
+    """Format ProtocolSection.ReferencesModule
+
+    See https://clinicaltrials.gov/data-api/about-api/study-data-structure#ReferencesModule
+
+    :param references_input: raw JSON
+    :return: structured data, if any references are given
+    """
+    references = references_input.get("references")
+    return [_format_reference(r) for r in references] if references else None
+
+
+# (Protocol field, raw protocol section key, formatter) for each protocol module
+_PROTOCOL_MODULES = (
+    ("identification", "identificationModule", _format_protocol_id),
+    ("status", "statusModule", _format_status),
+    (
+        "sponsor_collaborators",
+        "sponsorCollaboratorsModule",
+        _format_sponsor_collaborators,
+    ),
+    ("oversight", "oversightModule", _format_oversight),
+    ("description", "description", _format_protocol_description),
+    ("conditions", "conditionsModule", _format_conditions),
+    ("design", "designModule", _format_design),
+    ("arms_intervention", "armsInterventionsModule", _format_arms_interventions),
+    ("outcomes", "outcomes", _format_outcomes),
+    ("eligibility", "eligibilityModule", _format_eligibility),
+    ("contacts_locations", "contactsLocationsModule", _format_locations),
+    ("references", "referencesModule", _format_references),
+)
+
+
 def _format_protocol(protocol_input: dict) -> Protocol:
     """Format ProtocolSection
 
@@ -822,56 +885,13 @@ def _format_protocol(protocol_input: dict) -> Protocol:
     :param protocol_input: raw JSON
     :return: structured data
     """
-    conditions = (
-        ProtocolConditions(
-            conditions=protocol_input["conditionsModule"].get("conditions"),
-            keywords=protocol_input["conditionsModule"].get("keywords"),
-        )
-        if "conditionsModule" in protocol_input
-        else None
-    )
     return Protocol(
-        identification=_format_protocol_id(protocol_input["identificationModule"])
-        if "identificationModule" in protocol_input
-        else None,
-        status=_format_status(protocol_input["statusModule"])
-        if "statusModule" in protocol_input
-        else None,
-        sponsor_collaborators=_format_sponsor_collaborators(
-            protocol_input["sponsorCollaboratorsModule"]
-        )
-        if "sponsorCollaboratorsModule" in protocol_input
-        else None,
-        oversight=_format_oversight(protocol_input["oversightModule"])
-        if "oversightModule" in protocol_input
-        else None,
-        description=_format_protocol_description(protocol_input["description"])
-        if "description" in protocol_input
-        else None,
-        conditions=conditions,
-        design=_format_design(protocol_input["designModule"])
-        if "designModule" in protocol_input
-        else None,
-        arms_intervention=_format_arms_interventions(
-            protocol_input["armsInterventionsModule"]
-        )
-        if "armsInterventionsModule" in protocol_input
-        else None,
-        outcomes=_format_outcomes(protocol_input["outcomes"])
-        if "outcomes" in protocol_input
-        else None,
-        eligibility=_format_eligibility(protocol_input["eligibilityModule"])
-        if "eligibilityModule" in protocol_input
-        else None,
-        contacts_locations=_format_locations(protocol_input["contactsLocationsModule"])
-        if "contactsLocationsModule" in protocol_input
-        else None,
-        references=[
-            _format_reference(r)
-            for r in protocol_input["referencesModule"]["references"]
-        ]
-        if protocol_input.get("referencesModule", {}).get("references")
-        else None,
+        **{
+            field: formatter(module_input)
+            if (module_input := protocol_input.get(key)) is not None
+            else None
+            for field, key, formatter in _PROTOCOL_MODULES
+        }
     )
 
 
@@ -926,7 +946,7 @@ def _format_event(event_input: dict) -> AdverseEvent:
         term=event_input.get("term"),
         organ_system=event_input.get("organSystem"),
         source_vocabulary=event_input.get("sourceVocabulary"),
-        assessment_type=EventAssessment(event_input["assessmentType"].lower())
+        assessment_type=get_enum(event_input["assessmentType"], EventAssessment)
         if "assessmentType" in event_input
         else None,
         stats=[
@@ -1076,30 +1096,35 @@ def _get_id(study_response: dict, url: str, i: int) -> str | None:
     return study_id
 
 
-def make_fda_clinical_trials_request(
+def iter_fda_clinical_trials_request(
     url: str, skip_parsing_failures: bool
-) -> list[Study]:
-    """Issue a request against provided URL for FDA Clinical Trials API
+) -> Iterator[Study]:
+    """Iterate over studies returned by the FDA Clinical Trials API for provided URL
+
+    Pages have to be requested in order, since each response provides the token for
+    the next one, but the next page is fetched in the background while the studies
+    in the current page are formatted and yielded.
 
     :param url: URL to request. This method doesn't add any additional parameters except
         for pagination.
     :param skip_parsing_failures: if ``True``, catch and suppress failures to parse
         study metadata
-    :return: studies contained in API response
+    :return: iterator over studies contained in API response
     """
-    results = []
-    next_page_token = None
-    while True:
-        formatted_url = f"{url}&pageToken={next_page_token}" if next_page_token else url
-        with requests.get(formatted_url, timeout=30) as r:
-            try:
-                r.raise_for_status()
-            except RequestException as e:
-                _logger.warning(
-                    "Request to %s returned status code %s", url, r.status_code
-                )
-                raise e
-            raw_data = r.json()
+    next_page_url = url
+    executor = ThreadPoolExecutor(max_workers=1)
+    try:
+        next_page = executor.submit(get_json, next_page_url)
+        while next_page:
+            formatted_url = next_page_url
+            raw_data = next_page.result()
+            next_page_token = raw_data.get("nextPageToken")
+            if next_page_token:
+                next_page_url = f"{url}&pageToken={next_page_token}"
+                next_page = executor.submit(get_json, next_page_url)
+            else:
+                next_page = None
+
             for i, study in enumerate(raw_data.get("studies", [])):
                 try:
                     parsed_data = _format_study(study)
@@ -1109,16 +1134,30 @@ def make_fda_clinical_trials_request(
                         _logger.warning("Failed to parse study %s: %s", nct_id, e)
                         continue
                     raise e
-                results.append(parsed_data)
+                yield parsed_data
+    finally:
+        # don't wait on a prefetched page if the caller stops iterating early
+        executor.shutdown(wait=False, cancel_futures=True)
 
-            next_page_token = raw_data.get("nextPageToken")
-            if not next_page_token:
-                break
-    return results
+
+def make_fda_clinical_trials_request(
+    url: str, skip_parsing_failures: bool
+) -> list[Study]:
+    """Issue a request against provided URL for FDA Clinical Trials API
+
+    :param url: URL to request. This method doesn't add any additional parameters except
+        for pagination.
+    :param skip_parsing_failures: if ``True``, catch and suppress failures to parse
+        study metadata
+    :return: studies contained in API response
+    """
+    return list(iter_fda_clinical_trials_request(url, skip_parsing_failures))
 
 
 def get_clinical_trials(
-    drug_name: str | None = None, skip_parsing_failures: bool = False
+    drug_name: str | None = None,
+    skip_parsing_failures: bool = False,
+    page_size: int = 1000,
 ) -> list[Study]:
     """Get data from the FDA Clinical Trials API.
 
@@ -1130,12 +1169,14 @@ def get_clinical_trials(
         API intervention parameter, which appears to search for inclusion as a substring
         rather than a full-span match
     :param skip_parsing_failures: if ``True``
+    :param page_size: number of studies to request per page. Defaults to the API
+        maximum, which minimizes the number of round trips needed for large queries.
     :return: list of matching trial descriptions
     """
     if not drug_name:
         msg = "Must supply a query parameter like `drug_name`"
         raise ValueError(msg)
-    params = ["pageSize=50"]
+    params = [f"pageSize={page_size}"]
     if drug_name:
         params.append(f"query.intr={drug_name}")
     url = f"https://clinicaltrials.gov/api/v2/studies?{'&'.join(params)}"
@@ -3,16 +3,27 @@
 import datetime
 import logging
 import re
+import sys
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
+from functools import lru_cache
 from typing import NamedTuple, TypeVar
 
-import requests
-from requests.exceptions import RequestException
+from requests.exceptions import HTTPError
 
-from regbot.fetch.class_utils import map_to_enum
+from regbot.fetch.class_utils import add_enum_aliases
+from regbot.fetch.http_utils import (
+    MAX_CONCURRENT_REQUESTS,
+    get_json,
+    map_concurrently,
+)
 
 _logger = logging.getLogger(__name__)
 
+# openFDA rejects requests with a ``skip`` value beyond this
+_MAX_SKIP = 25000
+
 
 class SubmissionType(str, Enum):
     """Provide values for FDA submission type."""
@@ -38,17 +49,15 @@ class SubmissionReviewPriority(str, Enum):
     REQUIRE_901 = "require_901"
     ORDER_901 = "order_901"
 
-    @classmethod
-    def _missing_(cls, value):  # noqa: ANN001 ANN206
-        return map_to_enum(
-            cls,
-            value,
-            {
-                "n/a": cls.N_A,
-                "901_required": cls.REQUIRE_901,
-                "901_order": cls.ORDER_901,
-            },
-        )
+
+add_enum_aliases(
+    SubmissionReviewPriority,
+    {
+        "n/a": SubmissionReviewPriority.N_A,
+        "901_required": SubmissionReviewPriority.REQUIRE_901,
+        "901_order": SubmissionReviewPriority.ORDER_901,
+    },
+)
 
 
 class SubmissionClassCode(str, Enum):
@@ -90,7 +99,7 @@ class ApplicationDocType(str, Enum):
     HEALTHCARE_PROFESSIONAL_SHEET = "healthcare_professional_sheet"
     LABEL = "label"
     LETTER = "letter"
-    MEDICATION_GUIDE = ("medication_guide",)
+    MEDICATION_GUIDE = "medication_guide"
     OTHER = "other"
     OTHER_IMPORTANT_INFORMATION_FROM_FDA = "other_important_information_from_fda"
     PATIENT_INFORMATION_SHEET = "patient_information_sheet"
@@ -155,11 +164,11 @@ class OpenFdaProductType(str, Enum):
     HUMAN_PRESCRIPTION_DRUG = "human_prescription_drug"
     HUMAN_OTC_DRUG = "human_otc_drug"
 
-    @classmethod
-    def _missing_(cls, value):  # noqa: ANN001 ANN206
-        return map_to_enum(
-            cls, value, {"human prescription drug": cls.HUMAN_PRESCRIPTION_DRUG}
-        )
+
+add_enum_aliases(
+    OpenFdaProductType,
+    {"human prescription drug": OpenFdaProductType.HUMAN_PRESCRIPTION_DRUG},
+)
 
 
 class ProductRoute(str, Enum):
@@ -230,16 +239,14 @@ class ProductRoute(str, Enum):
     URETHRAL = "urethral"
     VAGINAL = "vaginal"
 
-    @classmethod
-    def _missing_(cls, value):  # noqa: ANN001 ANN206
-        return map_to_enum(
-            cls,
-            value,
-            {
-                "n/a": cls.N_A,
-                "powder,for_solution": cls.POWDER_FOR_SOLUTION,
-            },
-        )
+
+add_enum_aliases(
+    ProductRoute,
+    {
+        "n/a": ProductRoute.N_A,
+        "powder,for_solution": ProductRoute.POWDER_FOR_SOLUTION,
+    },
+)
 
 
 class OpenFda(NamedTuple):
@@ -336,9 +343,10 @@ class ProductMarketingStatus(str, Enum):
     NONE_TENTATIVE_APPROVAL = "none_tentative_approval"
     NONE = "none"
 
-    @classmethod
-    def _missing_(cls, value):  # noqa: ANN001 ANN206
-        return map_to_enum(cls, value, {"over-the-counter": cls.OTC})
+
+add_enum_aliases(
+    ProductMarketingStatus, {"over-the-counter": ProductMarketingStatus.OTC}
+)
 
 
 class ProductDosageForm(str, Enum):
@@ -438,34 +446,31 @@ class ProductDosageForm(str, Enum):
     VIAL = "vial"
 
 
+_TRUTHY_VALUES = {"yes": True, "no": False, "tbd": None}
+
+
 def _make_truthy(status: str | None) -> bool | None:
     if status is None:
         return None
-    lower_status = status.lower()
-    if lower_status == "no":
-        return False
-    if lower_status == "yes":
-        return True
-    if lower_status == "tbd":
-        return None
-    msg = f"Encountered unknown value for converting to bool: {status}"
-    raise ValueError(msg)
+    try:
+        return _TRUTHY_VALUES[status.lower()]
+    except KeyError:
+        msg = f"Encountered unknown value for converting to bool: {status}"
+        raise ValueError(msg) from None
 
 
 # generic enum type for enumify utility
 _EnumType = TypeVar("_EnumType", bound=Enum)
 
+# single-character substitutions used to turn raw values into enum values
+_ENUMIFY_TRANSLATION = str.maketrans({" ": "_", "-": "_", "/": "_", "(": "", ")": ""})
 
+
+@lru_cache(maxsize=4096)
 def _enumify(value: str, CandidateEnum: type[_EnumType]) -> _EnumType:  # noqa: N803
     try:
         return CandidateEnum(
-            value.lower()
-            .replace(", ", "_")
-            .replace(" ", "_")
-            .replace("-", "_")
-            .replace("(", "")
-            .replace(")", "")
-            .replace("/", "_")
+            value.lower().replace(", ", "_").translate(_ENUMIFY_TRANSLATION)
         )
     except ValueError as e:
         _logger.error(
@@ -474,6 +479,7 @@ def _enumify(value: str, CandidateEnum: type[_EnumType]) -> _EnumType:  # noqa:
         raise e
 
 
+@lru_cache(maxsize=8192)
 def _intify(value: str) -> int | None:
     try:
         return int(value)
@@ -482,20 +488,28 @@ def _intify(value: str) -> int | None:
         return None
 
 
+@lru_cache(maxsize=8192)
 def _make_datetime(value: str) -> datetime.datetime | None:
     try:
-        return datetime.datetime.strptime(value, "%Y%m%d").replace(tzinfo=datetime.UTC)
+        if len(value) != 8 or not (value.isascii() and value.isdigit()):
+            raise ValueError
+        return datetime.datetime(
+            int(value[:4]), int(value[4:6]), int(value[6:]), tzinfo=datetime.UTC
+        )
     except ValueError:
         _logger.error("Unable to convert value '%s' to datetime", value)
         return None
 
 
+# split compound product routes, but not multi-word terms like "oral, extended release"
+_ROUTE_SPLIT_PATTERN = re.compile(r", (?!delayed|extended)")
+
+
 def _get_product(data: dict) -> Product:
     reference_drug = _make_truthy(data["reference_drug"])
+    reference_standard = data.get("reference_standard")
     reference_standard = (
-        _make_truthy(data["reference_standard"])
-        if data.get("reference_standard")
-        else None
+        _make_truthy(reference_standard) if reference_standard else None
     )
     dosage_form = _enumify(data["dosage_form"], ProductDosageForm)
     raw_route = data.get("route")
@@ -503,23 +517,18 @@ def _get_product(data: dict) -> Product:
         route = None
     else:
         if isinstance(raw_route, str):
-            raw_route = re.split(r", (?!delayed|extended)", raw_route)
+            raw_route = _ROUTE_SPLIT_PATTERN.split(raw_route)
         route = [_enumify(r, ProductRoute) for r in raw_route]
     marketing_status = _enumify(data["marketing_status"], ProductMarketingStatus)
-    te_code = (
-        _enumify(data["te_code"], ProductTherapeuticEquivalencyCode)
-        if data.get("te_code")
-        else None
-    )
+    te_code = data.get("te_code")
+    te_code = _enumify(te_code, ProductTherapeuticEquivalencyCode) if te_code else None
 
     return Product(
-        product_number=data["product_number"],
+        product_number=sys.intern(data["product_number"]),
         reference_drug=reference_drug,
-        brand_name=data["brand_name"],
+        brand_name=sys.intern(data["brand_name"]),
         active_ingredients=[
-            ActiveIngredient(**ai)
-            if "strength" in ai
-            else ActiveIngredient(name=ai["name"], strength=None)
+            ActiveIngredient(name=ai["name"], strength=ai.get("strength"))
             for ai in data["active_ingredients"]
         ],
         reference_standard=reference_standard,
@@ -543,31 +552,30 @@ def _get_application_docs(data: list[dict]) -> list[ApplicationDoc]:
 
 
 def _get_submission(data: dict) -> Submission:
+    submission_type = data.get("submission_type")
     submission_type = (
-        _enumify(data["submission_type"], SubmissionType)
-        if data.get("submission_type")
-        else None
+        _enumify(submission_type, SubmissionType) if submission_type else None
     )
     submission_number = _intify(data["submission_number"])
+    submission_status = data.get("submission_status")
     submission_status = (
-        _enumify(data["submission_status"], SubmissionStatus)
-        if data.get("submission_status")
-        else None
+        _enumify(submission_status, SubmissionStatus) if submission_status else None
     )
     submission_status_date = _make_datetime(data["submission_status_date"])
+    review_priority = data.get("review_priority")
     review_priority = (
-        _enumify(data["review_priority"], SubmissionReviewPriority)
-        if data.get("review_priority")
-        else None
+        _enumify(review_priority, SubmissionReviewPriority) if review_priority else None
     )
+    submission_class_code = data.get("submission_class_code")
     submission_class_code = (
-        _enumify(data["submission_class_code"], SubmissionClassCode)
-        if data.get("submission_class_code")
+        _enumify(submission_class_code, SubmissionClassCode)
+        if submission_class_code
         else None
     )
+    application_docs = data.get("application_docs")
     application_docs = (
-        _get_application_docs(data["application_docs"])
-        if "application_docs" in data
+        _get_application_docs(application_docs)
+        if application_docs is not None
         else None
     )
 
@@ -583,75 +591,115 @@ def _get_submission(data: dict) -> Submission:
     )
 
 
+# openFDA fields that are copied over as-is
+_OPENFDA_PASSTHROUGH_FIELDS = tuple(
+    field for field in OpenFda._fields if field not in {"product_type", "route"}
+)
+
+_OPENFDA_INTERNED_FIELDS = (
+    "brand_name",
+    "generic_name",
+    "manufacturer_name",
+    "substance_name",
+    "pharm_class_epc",
+    "pharm_class_cs",
+    "pharm_class_moa",
+)
+
+
 def _get_openfda(data: dict) -> OpenFda:
-    product_type = (
-        [_enumify(pt, OpenFdaProductType) for pt in data["product_type"]]
-        if "product_type" in data
-        else None
-    )
-    route = (
-        [_enumify(rt, ProductRoute) for rt in data["route"]]
-        if "route" in data
-        else None
-    )
-    return OpenFda(
-        application_number=data.get("application_number"),
-        brand_name=data.get("brand_name"),
-        generic_name=data.get("generic_name"),
-        manufacturer_name=data.get("manufacturer_name"),
-        product_ndc=data.get("product_ndc"),
-        product_type=product_type,
-        route=route,
-        substance_name=data.get("substance_name"),
-        rxcui=data.get("rxcui"),
-        spl_id=data.get("spl_id"),
-        spl_set_id=data.get("spl_set_id"),
-        package_ndc=data.get("package_ndc"),
-        nui=data.get("nui"),
-        pharm_class_epc=data.get("pharm_class_epc"),
-        pharm_class_cs=data.get("pharm_class_cs"),
-        pharm_class_moa=data.get("pharm_class_moa"),
-        unii=data.get("unii"),
-    )
+    product_type = data.get("product_type")
+    if product_type is not None:
+        product_type = [_enumify(pt, OpenFdaProductType) for pt in product_type]
+    route = data.get("route")
+    if route is not None:
+        route = [_enumify(rt, ProductRoute) for rt in route]
+    passthrough = {field: data.get(field) for field in _OPENFDA_PASSTHROUGH_FIELDS}
+    for field in _OPENFDA_INTERNED_FIELDS:
+        values = passthrough[field]
+        if isinstance(values, list):
+            passthrough[field] = [sys.intern(v) for v in values]
+    return OpenFda(product_type=product_type, route=route, **passthrough)
 
 
 def _get_result(data: dict) -> Result:
+    openfda = data.get("openfda")
     return Result(
         submissions=[_get_submission(s) for s in data["submissions"]],
         application_number=data["application_number"],
-        sponsor_name=data["sponsor_name"],
-        openfda=_get_openfda(data["openfda"]) if "openfda" in data else None,
+        sponsor_name=sys.intern(data["sponsor_name"]),
+        openfda=_get_openfda(openfda) if openfda is not None else None,
         products=[_get_product(p) for p in data["products"]],
     )
 
 
-def make_drugsatfda_request(url: str, limit: int = 500) -> list[Result] | None:
+def iter_drugsatfda_request(
+    url: str, limit: int = 1000, max_workers: int = MAX_CONCURRENT_REQUESTS
+) -> Iterator[Result]:
+    """Iterate over Drugs@FDA data given an API query URL.
+
+    The first page is fetched on its own to learn the total number of results; all
+    remaining pages are then requested concurrently, and results are yielded in order
+    as soon as their page is available. openFDA doesn't allow paging past a ``skip``
+    of 25000, so results beyond that point are not retrieved.
+
+    :param url: URL to request
+    :param limit: # of results per page (openFDA allows at most 1000)
+    :param max_workers: max # of pages to request at once. If 1, pages are requested
+        one after another.
+    :return: iterator over Drugs@FDA ``Result``s
+    :raise RequestException: if HTTP response status != 200
+    """
+    data = get_json(f"{url}&limit={limit}&skip=0")
+    total = data["meta"]["results"]["total"]
+    last_skip = _MAX_SKIP // limit * limit
+    if total > last_skip + limit:
+        _logger.warning(
+            "Query %s matched %s results, but only the first %s can be paged through",
+            url,
+            total,
+            last_skip + limit,
+        )
+    page_urls = [
+        f"{url}&limit={limit}&skip={skip}"
+        for skip in range(limit, min(total, last_skip + 1), limit)
+    ]
+    if max_workers == 1:
+        yield from (_get_result(r) for r in data["results"])
+        for page_url in page_urls:
+            yield from (_get_result(r) for r in get_json(page_url)["results"])
+        return
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        pages = executor.map(get_json, page_urls)
+        yield from (_get_result(r) for r in data["results"])
+        for page in pages:
+            yield from (_get_result(r) for r in page["results"])
+    finally:
+        # don't keep fetching pages if the caller stops iterating early
+        executor.shutdown(cancel_futures=True)
+
+
+def make_drugsatfda_request(
+    url: str, limit: int = 1000, max_workers: int = MAX_CONCURRENT_REQUESTS
+) -> list[Result] | None:
     """Get Drugs@FDA data given an API query URL.
 
     :param url: URL to request
-    :param limit: # of results per page
+    :param limit: # of results per page (openFDA allows at most 1000)
+    :param max_workers: max # of pages to request at once
     :return: list of Drugs@FDA ``Result``s if successful
     :raise RequestException: if HTTP response status != 200
     """
-    results = []
-    remaining = True
-    skip = 0
-    while remaining:
-        full_url = f"{url}&limit={limit}&skip={skip}"
-        _logger.debug("Issuing GET request to %s", full_url)
-        with requests.get(full_url, timeout=30) as r:
-            try:
-                r.raise_for_status()
-            except RequestException as e:
-                _logger.warning(
-                    "Request to %s returned status code %s", full_url, r.status_code
-                )
-                raise e
-            data = r.json()
-        results += data["results"]
-        skip = data["meta"]["results"]["skip"] + len(data["results"])
-        remaining = (data["meta"]["results"]["total"] > skip) or (skip >= 25000)
-    return [_get_result(r) for r in results]
+    return list(iter_drugsatfda_request(url, limit, max_workers))
+
+
+_ANDA_URL = (
+    "https://api.fda.gov/drug/drugsfda.json?search=openfda.application_number:ANDA{}"
+)
+_NDA_URL = (
+    "https://api.fda.gov/drug/drugsfda.json?search=openfda.application_number:NDA{}"
+)
 
 
 def get_anda_results(anda: str) -> list[Result] | None:
@@ -660,8 +708,7 @@ def get_anda_results(anda: str) -> list[Result] | None:
     :param anda: ANDA code (should be a six-digit number formatted as a string)
     :return: list of Drugs@FDA ``Result``s if successful
     """
-    url = f"https://api.fda.gov/drug/drugsfda.json?search=openfda.application_number:ANDA{anda}"
-    return make_drugsatfda_request(url)
+    return make_drugsatfda_request(_ANDA_URL.format(anda))
 
 
 def get_nda_results(nda: str) -> list[Result] | None:
@@ -670,5 +717,56 @@ def get_nda_results(nda: str) -> list[Result] | None:
     :param nda: NDA code (should be a six-digit number formatted as a string)
     :return: list of Drugs@FDA ``Result``s if successful
     """
-    url = f"https://api.fda.gov/drug/drugsfda.json?search=openfda.application_number:NDA{nda}"
-    return make_drugsatfda_request(url)
+    return make_drugsatfda_request(_NDA_URL.format(nda))
+
+
+def _get_application_results(url: str) -> list[Result] | None:
+    """Get Drugs@FDA data for a single application within a batch lookup.
+
+    Pages are requested one after another, so that total concurrency stays bounded
+    by ``map_concurrently``.
+
+    :param url: URL to request
+    :return: list of Drugs@FDA ``Result``s, or ``None`` if openFDA found no matches
+    :raise RequestException: if HTTP response status != 200 or 404
+    """
+    try:
+        return make_drugsatfda_request(url, max_workers=1)
+    except HTTPError as e:
+        # openFDA responds to searches with no hits with a 404
+        if e.response is not None and e.response.status_code == 404:
+            return None
+        raise
+
+
+def _get_many_results(
+    url_template: str, application_ids: Iterable[str]
+) -> list[list[Result] | None]:
+    """Look up several applications concurrently.
+
+    :param url_template: query URL with a placeholder for the application code
+    :param application_ids: application codes to look up
+    :return: results for each application, in the order given
+    """
+    urls = [url_template.format(application_id) for application_id in application_ids]
+    return map_concurrently(_get_application_results, urls)
+
+
+def get_many_anda_results(andas: Iterable[str]) -> list[list[Result] | None]:
+    """Get Drugs@FDA data for several ANDA IDs at once.
+
+    :param andas: ANDA codes (should be six-digit numbers formatted as strings)
+    :return: list of Drugs@FDA ``Result``s for each ANDA, in the order given, or
+        ``None`` for ANDAs with no matches
+    """
+    return _get_many_results(_ANDA_URL, andas)
+
+
+def get_many_nda_results(ndas: Iterable[str]) -> list[list[Result] | None]:
+    """Get Drugs@FDA data for several NDA IDs at once.
+
+    :param ndas: NDA codes (should be six-digit numbers formatted as strings)
+    :return: list of Drugs@FDA ``Result``s for each NDA, in the order given, or
+        ``None`` for NDAs with no matches
+    """
+    return _get_many_results(_NDA_URL, ndas)
@@ -0,0 +1,170 @@
+"""Provide helper methods for requesting and decoding data from external APIs."""
+
+import datetime
+import logging
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from typing import TypeVar
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.exceptions import RequestException
+from urllib3.util import Retry
+
+from regbot import __version__
+
+try:
+    from orjson import loads as _loads
+except ImportError:  # pragma: no cover
+    from json import loads as _loads
+
+_logger = logging.getLogger(__name__)
+
+# max number of requests issued at once by concurrent lookups
+MAX_CONCURRENT_REQUESTS = 8
+
+_T = TypeVar("_T")
+_R = TypeVar("_R")
+
+
+def _configure_session(session: requests.Session) -> requests.Session:
+    """Set up a session with connection pooling and retries on transient errors.
+
+    :param session: session to configure
+    :return: configured session
+    """
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=16,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist=(429, 500, 502, 503, 504),
+            # hand the final response back so callers can log and raise on it
+            raise_on_status=False,
+        ),
+    )
+    session.mount("https://", adapter)
+    session.headers["User-Agent"] = f"regbot/{__version__}"
+    return session
+
+
+_default_session = _configure_session(requests.Session())
+_session = _default_session
+
+
+def get_session() -> requests.Session:
+    """Get the session shared by all outgoing API requests.
+
+    Reusing one session keeps connections to each API alive between requests, rather
+    than paying for a new TCP and TLS handshake every time.
+
+    :return: shared session
+    """
+    return _session
+
+
+def use_session(session: requests.Session | None) -> None:
+    """Set the session used for all outgoing API requests.
+
+    Use this to plug in a session with custom behavior, such as proxies or a
+    differently configured response cache (see ``enable_cache`` for the default one).
+
+    :param session: session to use, or ``None`` to restore the default session
+    """
+    global _session
+    _session = session if session is not None else _default_session
+
+
+def enable_cache(
+    cache_name: str = "regbot_http",
+    expire_after: datetime.timedelta = datetime.timedelta(days=7),
+) -> None:
+    """Cache successful API responses in a local SQLite database.
+
+    Regulatory data changes slowly, so repeated queries can usually be answered
+    without going back to the network. Requires the optional ``requests-cache``
+    dependency, e.g. ``pip install 'regbot[cache]'``.
+
+    :param cache_name: path to the cache database
+    :param expire_after: how long cached responses remain valid
+    :raise ImportError: if ``requests-cache`` isn't installed
+    """
+    try:
+        from requests_cache import CachedSession
+    except ImportError as e:
+        msg = "Response caching requires `requests-cache`: install `regbot[cache]`"
+        raise ImportError(msg) from e
+    session = CachedSession(
+        cache_name,
+        backend="sqlite",
+        expire_after=expire_after,
+        allowable_codes=(200,),
+        allowable_methods=("GET",),
+    )
+    use_session(_configure_session(session))
+
+
+def clear_cache() -> None:
+    """Drop all cached API responses, if response caching is enabled.
+
+    Has no effect when the current session doesn't cache responses.
+    """
+    cache = getattr(_session, "cache", None)
+    if cache is not None:
+        cache.clear()
+
+
+def load_json(content: bytes) -> dict:
+    """Decode a raw JSON response body.
+
+    Uses ``orjson`` if it's available, which is considerably faster than the standard
+    library parser on large responses. Decoding the raw bytes also skips the text
+    decoding pass that ``requests.Response.json()`` performs.
+
+    :param content: raw response body
+    :return: decoded JSON object
+    """
+    return _loads(content)
+
+
+def get_content(url: str) -> bytes:
+    """Issue a GET request with the shared session.
+
+    :param url: URL to request
+    :return: raw response body
+    :raise RequestException: if HTTP response status != 200
+    """
+    _logger.debug("Issuing GET request to %s", url)
+    with get_session().get(url, timeout=30) as r:
+        try:
+            r.raise_for_status()
+        except RequestException as e:
+            _logger.warning("Request to %s returned status code %s", url, r.status_code)
+            raise e
+        return r.content
+
+
+def get_json(url: str) -> dict:
+    """Issue a GET request with the shared session and decode its JSON response.
+
+    :param url: URL to request
+    :return: decoded JSON object
+    :raise RequestException: if HTTP response status != 200
+    """
+    return load_json(get_content(url))
+
+
+def map_concurrently(func: Callable[[_T], _R], items: Iterable[_T]) -> list[_R]:
+    """Call a request-issuing function on each item using a bounded thread pool.
+
+    Requests spend nearly all of their time waiting on the network, so running them
+    on threads over the shared session overlaps that latency rather than paying it
+    once per item.
+
+    :param func: function to call on each item
+    :param items: items to call ``func`` on
+    :return: results, in the order of ``items``
+    """
+    with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_REQUESTS) as executor:
+        return list(executor.map(func, items))
@@ -1,13 +1,15 @@
 """Fetch data from RxClass API."""
 
 import logging
+import sys
+from collections.abc import Iterable
 from enum import Enum
+from functools import partial
 from typing import NamedTuple
+from urllib.parse import quote
 
-import requests
-from requests.exceptions import RequestException
-
-from regbot.fetch.class_utils import map_to_enum
+from regbot.fetch.class_utils import add_enum_aliases, get_enum
+from regbot.fetch.http_utils import get_content, load_json, map_concurrently
 
 _logger = logging.getLogger(__name__)
 
@@ -92,16 +94,14 @@ class Relation(str, Enum):
     HAS_VA_CLASS = "has_va_class"
     HAS_VA_CLASS_EXTENDED = "has_va_class_extended"
 
-    @classmethod
-    def _missing_(cls, value):  # noqa: ANN001 ANN206
-        return map_to_enum(
-            cls,
-            value,
-            {
-                "has_vaclass": cls.HAS_VA_CLASS,
-                "has_vaclass_extended": cls.HAS_VA_CLASS_EXTENDED,
-            },
-        )
+
+add_enum_aliases(
+    Relation,
+    {
+        "has_vaclass": Relation.HAS_VA_CLASS,
+        "has_vaclass_extended": Relation.HAS_VA_CLASS_EXTENDED,
+    },
+)
 
 
 class RelationSource(str, Enum):
@@ -111,19 +111,21 @@ class RelationSource(str, Enum):
     ATCPROD = "atc_prod"
     DAILYMED = "dailymed"
     FDASPL = "fda_spl"
-    FMTSME = ("fmtsme",)
+    FMTSME = "fmtsme"
     MEDRT = "med_rt"
     RXNORM = "rxnorm"
     SNOMEDCT = "snomedct"
     VA = "va"
 
-    @classmethod
-    def _missing_(cls, value):  # noqa: ANN001 ANN206
-        return map_to_enum(
-            cls,
-            value,
-            {"atcprod": cls.ATCPROD, "medrt": cls.MEDRT, "fdaspl": cls.FDASPL},
-        )
+
+add_enum_aliases(
+    RelationSource,
+    {
+        "atcprod": RelationSource.ATCPROD,
+        "medrt": RelationSource.MEDRT,
+        "fdaspl": RelationSource.FDASPL,
+    },
+)
 
 
 class RxClassEntry(NamedTuple):
@@ -137,8 +139,8 @@ class RxClassEntry(NamedTuple):
 
 def _get_concept(concept_raw: dict) -> DrugConcept:
     return DrugConcept(
-        concept_id=f"rxcui:{concept_raw['rxcui']}",
-        name=concept_raw["name"],
+        concept_id=sys.intern(f"rxcui:{concept_raw['rxcui']}"),
+        name=sys.intern(concept_raw["name"]),
         term_type=TermType[concept_raw["tty"]],
     )
 
@@ -147,17 +149,17 @@ def _get_classification(classification_raw: dict) -> DrugClassification:
     return DrugClassification(
         class_id=classification_raw["classId"],
         class_name=classification_raw["className"],
-        class_type=ClassType(classification_raw["classType"].lower()),
+        class_type=get_enum(classification_raw["classType"], ClassType),
         class_url=classification_raw.get("classUrl"),
     )
 
 
 def _get_rxclass_entry(drug_info: dict) -> RxClassEntry:
     raw_relation = drug_info.get("rela")
-    relation = Relation(raw_relation.lower()) if raw_relation else None
+    relation = get_enum(raw_relation, Relation) if raw_relation else None
     raw_relation_source = drug_info.get("relaSource")
     relation_source = (
-        RelationSource(raw_relation_source.lower()) if raw_relation_source else None
+        get_enum(raw_relation_source, RelationSource) if raw_relation_source else None
     )
     return RxClassEntry(
         concept=_get_concept(drug_info["minConcept"]),
@@ -176,24 +178,23 @@ def make_rxclass_request(url: str, include_snomedt: bool = False) -> list[RxClas
         may present publishability issues for data consumers.
     :return: processed list of drug class descriptions from RxClass
     """
-    with requests.get(url, timeout=30) as r:
-        try:
-            r.raise_for_status()
-        except RequestException as e:
-            _logger.warning("Request to %s returned status code %s", url, r.status_code)
-            raise e
-        raw_data = r.json()
+    content = get_content(url)
+    if content in (b"", b"{}"):  # unknown drugs get an empty response
+        return []
+    raw_data = load_json(content)
     if not raw_data:
         return []
-    processed_results = [
+    return [
         _get_rxclass_entry(entry)
         for entry in raw_data["rxclassDrugInfoList"]["rxclassDrugInfo"]
+        if include_snomedt
+        or (entry.get("relaSource") or "").lower() != RelationSource.SNOMEDCT.value
     ]
-    if not include_snomedt:
-        processed_results = [
-            r for r in processed_results if r.relation_source != RelationSource.SNOMEDCT
-        ]
-    return processed_results
+
+
+_DRUG_CLASS_URL = (
+    "https://rxnav.nlm.nih.gov/REST/rxclass/class/byDrugName.json?drugName={}"
+)
 
 
 def get_drug_class_info(
@@ -210,7 +211,21 @@ def get_drug_class_info(
         may present publishability issues for data consumers.
     :return: list of drug class descriptions from RxClass
     """
-    url = (
-        f"https://rxnav.nlm.nih.gov/REST/rxclass/class/byDrugName.json?drugName={drug}"
-    )
+    url = _DRUG_CLASS_URL.format(quote(drug, safe=""))
     return make_rxclass_request(url, include_snomedct)
+
+
+def get_many_drug_class_info(
+    drugs: Iterable[str], include_snomedct: bool = False
+) -> list[list[RxClassEntry]]:
+    """Get RxClass-provided drug info for several drugs, looked up in parallel.
+
+    :param drugs: RxNorm-provided drug names
+    :param include_snomedct: if ``True``, include class claims provided by SNOMEDCT.
+        These are provided under a different license from the rest of the data and
+        may present publishability issues for data consumers.
+    :return: list of drug class descriptions from RxClass for each drug, in the order
+        given
+    """
+    get_info = partial(get_drug_class_info, include_snomedct=include_snomedct)
+    return map_concurrently(get_info, drugs)
@@ -1,3 +1,4 @@
+import json
 from datetime import UTC, datetime
 from pathlib import Path
 
@@ -10,10 +11,49 @@ from regbot.fetch.clinical_trials import (
     Location,
     MeshConcept,
     Status,
+    _format_protocol_id,
+    _get_dt_object,
     get_clinical_trials,
+    iter_fda_clinical_trials_request,
 )
 
 
+@pytest.mark.parametrize(
+    ("raw_date", "expected"),
+    [
+        ("2023-01-12", datetime(2023, 1, 12, tzinfo=UTC)),
+        ("2023-01", datetime(2023, 1, 1, tzinfo=UTC)),
+        ("2023", datetime(2023, 1, 1, tzinfo=UTC)),
+    ],
+)
+def test_get_dt_object(raw_date: str, expected: datetime):
+    assert _get_dt_object(raw_date) == expected
+
+
+@pytest.mark.parametrize(
+    "raw_date",
+    [
+        "2023-13-01",
+        "2023-1",
+        "2023/01",
+        "Jan 2023",
+        "2023-W01-1",
+        " 202",
+        "2023-+1",
+        "2023-01-1 ",
+    ],
+)
+def test_get_dt_object_invalid(raw_date: str):
+    with pytest.raises(ValueError, match="Unable to format"):
+        _get_dt_object(raw_date)
+
+
+def test_format_protocol_id_missing_organization():
+    protocol_id = _format_protocol_id({"nctId": "NCT00000000", "briefTitle": "Title"})
+    assert protocol_id.nct_id == "clinicaltrials:NCT00000000"
+    assert protocol_id.organization is None
+
+
 def test_fetch_clinical_trials(fixtures_dir: Path):
     with pytest.raises(
         ValueError, match="Must supply a query parameter like `drug_name`"
@@ -75,3 +115,29 @@ def test_fetch_clinical_trials(fixtures_dir: Path):
         )
         # check that parsing errors are skipped
         results = get_clinical_trials(drug_name="zolgensma", skip_parsing_failures=True)
+
+
+def test_fetch_clinical_trials_pagination(fixtures_dir: Path):
+    first_page = json.loads(
+        (fixtures_dir / "fetch_clinical_trial_zolgensma.json").read_text()
+    )
+    last_page = {"studies": first_page["studies"][:2]}
+    first_page["nextPageToken"] = "abc123"
+    with requests_mock.Mocker() as m:
+        m.get(
+            "https://clinicaltrials.gov/api/v2/studies?query.intr=zolgensma",
+            text=json.dumps(first_page),
+        )
+        m.get(
+            "https://clinicaltrials.gov/api/v2/studies?query.intr=zolgensma&pageToken=abc123",
+            text=json.dumps(last_page),
+        )
+        results = get_clinical_trials(drug_name="zolgensma", page_size=100)
+        assert m.call_count == 2
+        assert all(r.qs["pagesize"] == ["100"] for r in m.request_history)
+        studies = iter_fda_clinical_trials_request(
+            "https://clinicaltrials.gov/api/v2/studies?query.intr=zolgensma", False
+        )
+        assert list(studies) == results
+    assert len(results) == len(first_page["studies"]) + 2
+    assert results[-1].protocol == results[1].protocol
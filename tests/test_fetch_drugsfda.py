@@ -1,10 +1,32 @@
 """Test regbot.fetch.drugsfda"""
 
+import json
+from datetime import UTC, datetime
 from pathlib import Path
 
+import pytest
 import requests_mock
 
-from regbot.fetch.drugsfda import get_anda_results, get_nda_results
+from regbot.fetch.drugsfda import (
+    _make_datetime,
+    get_anda_results,
+    get_many_anda_results,
+    get_nda_results,
+    iter_drugsatfda_request,
+    make_drugsatfda_request,
+)
+
+
+def test_make_datetime():
+    assert _make_datetime("20191125") == datetime(2019, 11, 25, tzinfo=UTC)
+
+
+@pytest.mark.parametrize(
+    "value",
+    ["2019W01", "2019-11-25", "2019-11-25T10:00:00+05:00", "20191325", " 2019112"],
+)
+def test_make_datetime_invalid(value: str):
+    assert _make_datetime(value) is None
 
 
 def test_get_anda_results(fixtures_dir: Path):
@@ -22,6 +44,27 @@ def test_get_anda_results(fixtures_dir: Path):
         assert len(results) > 0
 
 
+def test_get_many_anda_results(fixtures_dir: Path):
+    response = (fixtures_dir / "fetch_anda_falmina.json").read_text()
+    not_found = {"error": {"code": "NOT_FOUND", "message": "No matches found!"}}
+    with requests_mock.Mocker() as m:
+        m.get(
+            "https://api.fda.gov/drug/drugsfda.json?search=openfda.application_number:ANDA090721",
+            text=response,
+        )
+        m.get(
+            "https://api.fda.gov/drug/drugsfda.json?search=openfda.application_number:ANDA000000",
+            status_code=404,
+            text=json.dumps(not_found),
+        )
+
+        results = get_many_anda_results(["000000", "090721"])
+        assert m.call_count == 2
+    assert results[0] is None
+    assert results[1]
+    assert results[1][0].products
+
+
 def test_get_nda_results(fixtures_dir: Path):
     with (
         requests_mock.Mocker() as m,
@@ -35,3 +78,46 @@ def test_get_nda_results(fixtures_dir: Path):
         results = get_nda_results("207145")
         assert results
         assert len(results) > 0
+        assert results[0].submissions[0].submission_status_date == datetime(
+            2019, 11, 25, tzinfo=UTC
+        )
+
+
+def test_make_drugsatfda_request_pagination(fixtures_dir: Path):
+    page = json.loads((fixtures_dir / "fetch_nda_xadago.json").read_text())
+    page["meta"]["results"]["total"] = 3
+    url = "https://api.fda.gov/drug/drugsfda.json?search=openfda.application_number:NDA207145"
+    with requests_mock.Mocker() as m:
+        for skip in range(3):
+            m.get(f"{url}&limit=1&skip={skip}", text=json.dumps(page))
+
+        results = make_drugsatfda_request(url, limit=1)
+        assert len(results) == 3
+        assert m.call_count == 3
+        assert all(r.application_number == "NDA207145" for r in results)
+
+        assert list(iter_drugsatfda_request(url, limit=1)) == results
+        assert make_drugsatfda_request(url, limit=1, max_workers=1) == results
+
+
+@pytest.mark.parametrize(
+    ("limit", "last_skip"),
+    [(1000, 25000), (700, 24500)],
+)
+def test_make_drugsatfda_request_skip_limit(
+    fixtures_dir: Path, caplog, limit: int, last_skip: int
+):
+    page = json.loads((fixtures_dir / "fetch_nda_xadago.json").read_text())
+    page["meta"]["results"]["total"] = 40000
+    url = "https://api.fda.gov/drug/drugsfda.json?search=openfda.application_number:NDA207145"
+    n_pages = last_skip // limit + 1
+    with requests_mock.Mocker() as m:
+        m.get(url, text=json.dumps(page))
+
+        results = make_drugsatfda_request(url, limit=limit)
+        assert len(results) == n_pages
+        assert m.call_count == n_pages
+        skips = sorted(int(r.qs["skip"][0]) for r in m.request_history)
+    assert skips == list(range(0, last_skip + 1, limit))
+    assert max(skips) <= 25000
+    assert f"only the first {last_skip + limit} can be paged through" in caplog.text
@@ -0,0 +1,77 @@
+"""Test regbot.fetch.http_utils"""
+
+import sys
+from pathlib import Path
+
+import pytest
+import requests
+import requests_mock
+
+from regbot.fetch.drugsfda import get_anda_results
+from regbot.fetch.http_utils import (
+    clear_cache,
+    enable_cache,
+    get_json,
+    get_session,
+    use_session,
+)
+
+
+def test_clear_cache():
+    class FakeCache:
+        cleared = False
+
+        def clear(self):
+            self.cleared = True
+
+    session = requests.Session()
+    session.cache = FakeCache()
+    clear_cache()  # default session has no cache
+    use_session(session)
+    try:
+        clear_cache()
+    finally:
+        use_session(None)
+    assert session.cache.cleared
+
+
+def test_enable_cache(tmp_path: Path):
+    url = "https://rxnav.nlm.nih.gov/REST/rxclass/class/byDrugName.json?drugName=x"
+    enable_cache(str(tmp_path / "regbot_http"))
+    try:
+        with requests_mock.Mocker() as m:
+            m.get(url, text="{}")
+            assert not get_session().get(url, timeout=30).from_cache
+            assert get_session().get(url, timeout=30).from_cache
+            assert m.call_count == 1
+    finally:
+        use_session(None)
+
+
+def test_enable_cache_missing_dependency(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setitem(sys.modules, "requests_cache", None)
+    with pytest.raises(ImportError, match="requires `requests-cache`"):
+        enable_cache()
+
+
+def test_use_session(fixtures_dir: Path):
+    session = requests.Session()
+    session.headers["X-Test"] = "custom"
+    use_session(session)
+    try:
+        with requests_mock.Mocker() as m:
+            m.get(
+                "https://api.fda.gov/drug/drugsfda.json?search=openfda.application_number:ANDA090721",
+                text=(fixtures_dir / "fetch_anda_falmina.json").read_text(),
+            )
+            assert get_anda_results("090721")
+            assert m.last_request.headers["X-Test"] == "custom"
+    finally:
+        use_session(None)
+
+
+def test_get_json_empty_body():
+    with requests_mock.Mocker() as m:
+        m.get("https://example.org/empty", text="")
+        with pytest.raises(ValueError):  # noqa: PT011
+            get_json("https://example.org/empty")
@@ -12,6 +12,7 @@ from regbot.fetch.rxclass import (
     RxClassEntry,
     TermType,
     get_drug_class_info,
+    get_many_drug_class_info,
 )
 
 
@@ -56,3 +57,40 @@ def test_get_rxclass(fixtures_dir: Path):
         else:
             msg = "No classification found relating imatinib to class ID D054437"
             raise pytest.fail(msg)
+
+
+def test_get_many_drug_class_info(fixtures_dir: Path):
+    with requests_mock.Mocker() as m:
+        m.get(
+            "https://rxnav.nlm.nih.gov/REST/rxclass/class/byDrugName.json?drugName=not_a_drug",
+            text="{}",
+        )
+        m.get(
+            "https://rxnav.nlm.nih.gov/REST/rxclass/class/byDrugName.json?drugName=imatinib",
+            text=(fixtures_dir / "fetch_rxclass_imatinib.json").read_text(),
+        )
+        results = get_many_drug_class_info(["imatinib", "not_a_drug"])
+        assert m.call_count == 2
+    assert len(results[0]) == 46
+    assert results[1] == []
+
+
+def test_get_rxclass_include_snomedct(fixtures_dir: Path):
+    with requests_mock.Mocker() as m:
+        m.get(
+            "https://rxnav.nlm.nih.gov/REST/rxclass/class/byDrugName.json?drugName=imatinib",
+            text=(fixtures_dir / "fetch_rxclass_imatinib.json").read_text(),
+        )
+        results = get_drug_class_info("imatinib", include_snomedct=True)
+    assert len(results) == 50
+    assert sum(r.relation_source == RelationSource.SNOMEDCT for r in results) == 4
+
+
+def test_get_rxclass_quotes_drug_name():
+    with requests_mock.Mocker() as m:
+        m.get(
+            "https://rxnav.nlm.nih.gov/REST/rxclass/class/byDrugName.json",
+            text="{}",
+        )
+        assert get_drug_class_info("a&b drug") == []
+        assert m.last_request.qs["drugname"] == ["a&b drug"]